@@ -1,72 +1,79 @@
+from functools import lru_cache
+
 import numpy as np
 from logo_CDMA import logo
 
 print(logo)
 
+# The 8 station Walsh code used below, shipped as a constant
+_H8 = np.array([[1, 1, 1, 1, 1, 1, 1, 1],
+                [1, -1, 1, -1, 1, -1, 1, -1],
+                [1, 1, -1, -1, 1, 1, -1, -1],
+                [1, -1, -1, 1, 1, -1, -1, 1],
+                [1, 1, 1, 1, -1, -1, -1, -1],
+                [1, -1, 1, -1, -1, 1, -1, 1],
+                [1, 1, -1, -1, -1, -1, 1, 1],
+                [1, -1, -1, 1, -1, 1, 1, -1]], dtype=np.int8)
+_H8.setflags(write=False)
+
+
+@lru_cache(maxsize=16)
 def walsh_code(order):
-    # Walsh Code Generator
+    # Walsh Code Generator, cached per order and returned read-only
+    if order == 3:
+        return _H8
 
-    W = np.array([1])
-    for i in range(order):
-        W = np.tile(W, [2, 2])
-        half = 2 ** i
-        W[half:, half:] = np.negative(W[half:, half:])
+    # Sylvester-Hadamard entry: W[r, c] = (-1) ** popcount(r & c)
+    idx = np.arange(2 ** order)
+    rc = np.bitwise_and(idx[:, None], idx[None, :])
+    parity = np.zeros_like(rc)
+    for bit in range(order):
+        parity ^= (rc >> bit) & 1
+    W = (1 - 2 * parity).astype(np.int8)
+    W.setflags(write=False)
     return W
 
 
-print("Walsh code:\n", walsh_code(3))
-
-# Transforming into lists
-catch_on_list = walsh_code(3)
-transfer_to_list = catch_on_list.tolist()
+def fwht(a):
+    # Fast Walsh-Hadamard Transform, same as walsh_code(order) @ a in O(N log N)
 
-starting_range = 0
-ending_range = len(transfer_to_list)
+    # Butterflies run in place on one copy of the input, widened so that
+    # int8 codes cannot overflow
+    buf = np.asarray(a)
+    a = buf.astype(np.result_type(buf, np.int64), copy=buf is a)
+    n = len(a)
+    h = 1
+    while h < n:
+        v = a.reshape(-1, 2, h)
+        x = v[:, 0].copy()
+        v[:, 0] += v[:, 1]
+        np.subtract(x, v[:, 1], out=v[:, 1])
+        h *= 2
+    return a
 
-c1, c2, c3, c4, c5, c6, c7, c8 = [transfer_to_list[i] for i in (0, 1, 2, 3, 4, 5, 6, 7)]
 
+walsh_matrix = walsh_code(3)
+print("Walsh code:\n", walsh_matrix)
 
-# Get the data bits for the 8 stations
-d1 = int(input("Enter D1 for Station 1:"))
-d2 = int(input("Enter D2 for Station 2:"))
-d3 = int(input("Enter D3 for Station 3:"))
-d4 = int(input("Enter D4 for Station 4:"))
-d5 = int(input("Enter D5 for Station 5:"))
-d6 = int(input("Enter D6 for Station 6:"))
-d7 = int(input("Enter D7 for Station 7:"))
-d8 = int(input("Enter D8 for Station 8:"))
 
-# Resultant for each Station
-r1 = np.multiply(c1, d1)
-r2 = np.multiply(c2, d2)
-r3 = np.multiply(c3, d3)
-r4 = np.multiply(c4, d4)
-r5 = np.multiply(c5, d5)
-r6 = np.multiply(c6, d6)
-r7 = np.multiply(c7, d7)
-r8 = np.multiply(c8, d8)
+# Get the data bits for the 8 stations in one line
+num_stations = len(walsh_matrix)
+bits_format = f"{num_stations} integers separated by spaces, e.g. 1 -1 1 1 -1 1 -1 -1"
+try:
+    data_bits = [int(d) for d in input("Enter D1 to D8 for Stations 1 to 8 (space separated):").split()]
+except ValueError:
+    raise SystemExit(f"Data bits must be {bits_format}")
+if len(data_bits) != num_stations:
+    raise SystemExit(f"Expected {bits_format}, got {len(data_bits)} values")
 
-# Sum of total Resultant
-resultant_channel = r1 + r2 + r3 + r4 + r5 + r6 + r7 + r8
+# Sum of total Resultant: sum of d_i * c_i over all stations, i.e. W @ d
+resultant_channel = fwht(data_bits)
 print("Resultant Channel", resultant_channel)
 Channel = int(input("Enter  the station to listen for C1=1 ,C2=2, C3=3, C4=4, C5=5, C6=6, C7=7, C8=8 : "))
 
-if Channel == 1:
-    rc = c1
-elif Channel == 2:
-    rc = c2
-elif Channel == 3:
-    rc = c3
-elif Channel == 4:
-    rc = c4
-elif Channel == 5:
-    rc = c5
-elif Channel == 6:
-    rc = c6
-elif Channel == 7:
-    rc = c7
-elif Channel == 8:
-    rc = c8
+if not 1 <= Channel <= num_stations:
+    raise SystemExit(f"Station to listen must be between 1 and {num_stations}, got {Channel}")
+rc = walsh_matrix[Channel - 1]
 inner_product = np.multiply(resultant_channel, rc)
 
 print("Inner Product", inner_product)